@@ -1,53 +1,64 @@
 import pandas as pd
 import re
+import streamlit as st
 from urlextract import URLExtract
 
 extractor = URLExtract()
 
-def parse_and_preprocess(chat_text):
-    # Step 1: Regex patterns to identify message boundaries and components
-    line_start_pattern = re.compile(r'\[\d{1,2}/\d{1,2}/\d{2,4},\s\d{1,2}:\d{2}:\d{2}\s?[APap]?\.?[Mm]?\.?\]\s[^:]+:')
-    details_pattern = re.compile(r'\[(\d{1,2}/\d{1,2}/\d{2,4}),\s*(\d{1,2}:\d{2}:\d{2}[\s\u202f]?[APap]?\.?[Mm]?\.?)\]\s([^:]+):')
-
-    # Step 2: Parse messages
-    messages = line_start_pattern.split(chat_text)[1:]
-    headers = line_start_pattern.findall(chat_text)
-    
-    chat_data = []
-
-    for i in range(len(messages)):
-        match = details_pattern.match(headers[i])
-        if not match:
-            continue
-        date, time, sender = match.groups()
-        time = time.replace('\u202f', ' ').strip()
+# Bytes \s only matches ASCII whitespace, so spell out the UTF-8 encoding of
+# every character str \s accepts (NBSP, the narrow NBSP before AM/PM, ...)
+_WS = b'(?:' + b'|'.join(re.escape(chr(c).encode('utf-8')) for c in range(0x3001) if chr(c).isspace()) + b')'
+
+# Regex matching a message header and capturing its date, time and sender.
+# It runs on the raw UTF-8 bytes of the upload.
+_HEADER_RE = re.compile(
+    rb'\[(?P<date>\d{1,2}/\d{1,2}/\d{2,4}),' + _WS
+    + rb'(?P<time>\d{1,2}:\d{2}:\d{2}' + _WS + rb'?[APap]?\.?[Mm]?\.?)\]' + _WS
+    + rb'(?P<sender>[^:]+):'
+)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def parse_and_preprocess(chat_bytes):
+    # Step 1: Parse messages in a single pass, each body runs up to the next header.
+    # Only the captured pieces are decoded, never the whole file at once.
+    headers = list(_HEADER_RE.finditer(chat_bytes))
+
+    timestamps, senders, messages = [], [], []
+
+    for i, match in enumerate(headers):
+        date, time, sender = (part.decode('utf-8') for part in match.group('date', 'time', 'sender'))
+        time = ' '.join(time.split())
         timestamp_str = f"{date} {time}"
 
-        try:
-            timestamp = pd.to_datetime(timestamp_str, format='%d/%m/%y %I:%M:%S %p')
-        except ValueError:
-            try:
-                timestamp = pd.to_datetime(timestamp_str, format='%d/%m/%Y %H:%M:%S')
-            except ValueError:
-                continue
-
-        message = messages[i].strip()
-        chat_data.append([timestamp, sender.strip(), message])
-
-    # Step 3: Create DataFrame
-    df = pd.DataFrame(chat_data, columns=['timestamp', 'sender', 'message'])
-
-    # Step 4: Derived columns (no emoji column now)
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(chat_bytes)
+        message = chat_bytes[match.end():end].decode('utf-8').strip()
+        timestamps.append(timestamp_str)
+        senders.append(sender.strip())
+        messages.append(message)
+
+    # Step 2: Create DataFrame, parsing all timestamps at once (12h first, then 24h)
+    # dtype=str keeps the columns string-typed even when nothing matched, so an
+    # empty or non-export upload flows through the steps below as an empty frame
+    df = pd.DataFrame({'timestamp': timestamps, 'sender': senders, 'message': messages}, dtype=str)
+    timestamps_12h = pd.to_datetime(df['timestamp'], format='%d/%m/%y %I:%M:%S %p', errors='coerce')
+    timestamps_24h = pd.to_datetime(df['timestamp'], format='%d/%m/%Y %H:%M:%S', errors='coerce')
+    df['timestamp'] = timestamps_12h.fillna(timestamps_24h)
+    df = df.dropna(subset=['timestamp']).reset_index(drop=True)
+
+    # Step 3: Derived columns (no emoji column now)
     df['date'] = df['timestamp'].dt.date
     df['time'] = df['timestamp'].dt.time
     df['hour'] = df['timestamp'].dt.hour
     df['day_name'] = df['timestamp'].dt.day_name()
     df['month'] = df['timestamp'].dt.month_name()
 
-    df['word_count'] = df['message'].apply(lambda x: len(x.split()))
-    df['char_count'] = df['message'].apply(len)
-    df['url_count'] = df['message'].apply(lambda x: len(extractor.find_urls(x)))
-    df['media_flag'] = df['message'].apply(lambda x: '<Media omitted>' in x or x.lower().startswith('<media') or x.lower().startswith('omitted>'))
+    df['word_count'] = df['message'].str.split().str.len()
+    df['char_count'] = df['message'].str.len()
+    df['url_count'] = df['message'].apply(lambda x: len(extractor.find_urls(x))).astype(int)
+
+    # One alternation covers all media markers in a single scan per message:
+    # '<Media omitted>' anywhere, or a message starting with '<media'/'omitted>' in any case
+    df['media_flag'] = df['message'].str.contains(r'<Media omitted>|^(?i:<media|omitted>)')
 
     return df
 
@@ -70,15 +81,16 @@ def basic_chat_stats(df):
     }
 
 
-import streamlit as st
-
 st.title("WhatsApp Chat Visualizer")
 
 uploaded_file = st.file_uploader("Upload WhatsApp chat (.txt)", type=["txt"])
 
 if uploaded_file is not None:
-    chat_text = uploaded_file.getvalue().decode("utf-8")
-    df = parse_and_preprocess(chat_text)
+    # Cached on the uploaded bytes, so widget reruns don't re-parse the chat
+    df = parse_and_preprocess(uploaded_file.getvalue())
+    if df.empty:
+        st.error("No messages found. Please upload a WhatsApp chat export (.txt).")
+        st.stop()
     st.success("Chat processed successfully!")
 
     stats = basic_chat_stats(df)
@@ -0,0 +1,98 @@
+import sys
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = str(ROOT / "streamlit_app.py")
+sys.path.insert(0, str(ROOT))
+
+import streamlit_app  # noqa: E402
+
+
+def test_word_count_splits_on_unicode_whitespace():
+    chat = (
+        "[14/05/25, 9:33:53 PM] Alice: Salut\xa0! ça va\xa0?\n"
+        "[14/05/25, 9:34:00 PM] Bob: a\xa0b\u2003c\td\u3000e\n"
+    )
+    df = streamlit_app.parse_and_preprocess(chat.encode('utf-8'))
+    assert df['word_count'].tolist() == [5, 5]
+
+
+# Expected rows are what the original str-regex, per-row parser produced.
+@pytest.mark.parametrize("chat, expected", [
+    pytest.param(
+        "[14/05/25, 9:33:53\u202fPM] Alice: hi\n[14/05/25, 9:34:10\u202fAM] Bob: yo",
+        [('2025-05-14 21:33:53', 'Alice', 'hi'), ('2025-05-14 09:34:10', 'Bob', 'yo')],
+        id='narrow-nbsp-before-ampm',
+    ),
+    pytest.param(
+        "[14/05/25, 9:00:00 PM] Bob: first\n[14/05/25,\xa09:33:53 PM]\xa0Alice: hi",
+        [('2025-05-14 21:00:00', 'Bob', 'first'), ('2025-05-14 21:33:53', 'Alice', 'hi')],
+        id='nbsp-after-comma-and-bracket',
+    ),
+    pytest.param(
+        "\ufeff[14/05/25, 9:33:53 PM] Alice: hi",
+        [('2025-05-14 21:33:53', 'Alice', 'hi')],
+        id='bom-prefix',
+    ),
+    pytest.param(
+        "\u200e[14/05/25, 9:33:53 PM] Alice: hi",
+        [('2025-05-14 21:33:53', 'Alice', 'hi')],
+        id='lrm-prefix',
+    ),
+    pytest.param(
+        "[14/05/2025, 21:33:53] Alice: hi\n[1/6/2025, 08:05:00] Bob: morning",
+        [('2025-05-14 21:33:53', 'Alice', 'hi'), ('2025-06-01 08:05:00', 'Bob', 'morning')],
+        id='24h-fallback',
+    ),
+    pytest.param(
+        "[14/05/25, 9:33:53 PM] Alice: line one\nline two\n\n[14/05/25, 9:34:00 PM] Bob: ok\n",
+        [('2025-05-14 21:33:53', 'Alice', 'line one\nline two'), ('2025-05-14 21:34:00', 'Bob', 'ok')],
+        id='multi-line-body',
+    ),
+    pytest.param(
+        "[31/02/25, 9:00:00 PM] Bob: bad date\n[14/05/25, 9:33:53 PM] Alice: ok\n"
+        "[14/05/25, 25:61:00] Bob: bad time",
+        [('2025-05-14 21:33:53', 'Alice', 'ok')],
+        id='unparseable-timestamps-dropped',
+    ),
+])
+def test_parse_matches_original_parser(chat, expected):
+    df = streamlit_app.parse_and_preprocess(chat.encode('utf-8'))
+    rows = [(str(ts), sender, message) for ts, sender, message in df[['timestamp', 'sender', 'message']].itertuples(index=False)]
+    assert rows == expected
+
+
+@pytest.mark.parametrize("content", [b"", b"hello world"])
+def test_non_export_parses_to_empty_frame_with_full_schema(content):
+    expected = streamlit_app.parse_and_preprocess(b"[14/05/25, 9:33:53 PM] Alice: hi")
+    df = streamlit_app.parse_and_preprocess(content)
+    assert df.empty
+    assert list(df.columns) == list(expected.columns)
+    assert df['url_count'].dtype == expected['url_count'].dtype
+
+
+def run_with_upload(content):
+    at = AppTest.from_file(APP, default_timeout=30)
+    at.run()
+    at.file_uploader[0].upload("chat.txt", content, "text/plain")
+    at.run()
+    assert not at.exception
+    return at
+
+
+@pytest.mark.parametrize("content", [b"", b"hello world"])
+def test_non_export_upload_shows_error(content):
+    at = run_with_upload(content)
+    assert len(at.error) == 1
+    assert not at.success
+
+
+def test_long_preamble_before_first_header_is_parsed():
+    content = b"x" * 2000 + b"\n[14/05/25, 9:33:53 PM] Alice: hi"
+    at = run_with_upload(content)
+    assert not at.error
+    assert len(at.success) == 1
+    assert any("**Total Messages:** 1" in md.value for md in at.markdown)